@@ -1,16 +1,24 @@
-import io
+import concurrent.futures
+import datetime
+import heapq
+import itertools
 import os
+import queue
+import random
+import re
 import sys
 import threading
+import time
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
+import httplib2
+import requests
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from google_auth_httplib2 import AuthorizedHttp
 from google.oauth2 import credentials
 from google.oauth2 import service_account
-from google.auth.transport.requests import Request
-from googleapiclient.http import MediaIoBaseDownload
+from google.auth.transport.requests import AuthorizedSession, Request
 import logging
 import json
 
@@ -18,10 +26,48 @@ import json
 SCOPES = ['https://www.googleapis.com/auth/drive.readonly']
 # Change this to the name you want for the downloaded folder
 BASE_DOWNLOAD_FOLDER = "Downloaded_Files"
+# Seconds to wait on a connection before giving up on a request.
+HTTP_TIMEOUT = 30
+# Access tokens this close to expiring are refreshed before they are used.
+TOKEN_REFRESH_MARGIN = datetime.timedelta(seconds=60)
+# Transient failures (rate limits, server errors) are retried this many times...
+MAX_RETRIES = 6
+# ...waiting RETRY_BASE_DELAY * 2**attempt seconds, plus up to a second of jitter, in between.
+RETRY_BASE_DELAY = 1.0
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+# Drive also reports rate limiting as a 403 with one of these reasons.
+RATE_LIMIT_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded'}
+# Number of files downloaded concurrently.  Kept low to stay under Drive's per-user quota.
+MAX_DOWNLOAD_WORKERS = 8
+# Number of threads listing folders while the downloads run.
+MAX_LIST_WORKERS = 4
+# Drive accepts at most 100 calls in one batch request.
+MAX_BATCH_SIZE = 100
+# Largest page size Drive allows for files().list (the default is 100).
+LIST_PAGE_SIZE = 1000
+# Bytes fetched per range request of a parallel download.  Streamed files larger than
+# this also get their disk space reserved up front.
+DOWNLOAD_CHUNK_SIZE = 16 * 1024 * 1024
+# Bytes handed to the file per write while streaming.
+STREAM_CHUNK_SIZE = 1024 * 1024
+# Size of the write buffer for downloaded files, so small network reads don't become small writes.
+WRITE_BUFFER_SIZE = 4 * 1024 * 1024
+# Files larger than this are fetched as DOWNLOAD_CHUNK_SIZE ranges over several connections.
+PARALLEL_DOWNLOAD_THRESHOLD = 64 * 1024 * 1024
+# Number of ranges of one file fetched at the same time.
+MAX_RANGE_WORKERS = 4
+
+# Matches the folder ID in both shared URL formats:
+#   https://drive.google.com/drive/folders/{folder_id}?usp=sharing
+#   https://drive.google.com/folderview?id={folder_id}&usp=sharing  (older format)
+_FOLDER_ID_RE = re.compile(r'(?:folders/|folderview\?id=)([A-Za-z0-9_-]+)')
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# httplib2.Http objects are not thread-safe, so each worker thread keeps its own.
+_thread_local = threading.local()
+
 def get_service_account_credentials(filename='service_account.json'):
     """Gets credentials using a service account."""
     try:
@@ -89,6 +135,86 @@ def get_credentials(use_service_account=True, service_account_file='service_acco
     return get_credentials_interactive(token_path)
 
 
+class CachedTokenAuthorizedHttp(AuthorizedHttp):
+    """
+    AuthorizedHttp that builds the Authorization header once per access token instead of
+    running the credentials' before_request hook on every call.  The token is refreshed
+    once it is within TOKEN_REFRESH_MARGIN of expiring, or when a request is rejected.
+    """
+    def __init__(self, credentials, http=None, **kwargs):
+        super().__init__(credentials, http=http, **kwargs)
+        self._authorization_header = None
+        self._authorization_expiry = None
+
+    @staticmethod
+    def _is_expiring(expiry):
+        """Returns whether a token with this expiry (naive UTC, or None) should be replaced."""
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        return expiry is not None and expiry - now < TOKEN_REFRESH_MARGIN
+
+    def _get_authorization_header(self):
+        """Returns the cached Authorization header, refreshing the token if needed."""
+        if self._authorization_header is None or self._is_expiring(self._authorization_expiry):
+            # Another thread sharing the credentials may already have refreshed them.
+            if not self.credentials.token or self._is_expiring(self.credentials.expiry):
+                self.credentials.refresh(self._request)
+            self._authorization_header = f"Bearer {self.credentials.token}"
+            self._authorization_expiry = self.credentials.expiry
+        return self._authorization_header
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        """Sends a request with the cached Authorization header."""
+        request_headers = dict(headers) if headers else {}
+        request_headers["authorization"] = self._get_authorization_header()
+        quota_project_id = getattr(self.credentials, "quota_project_id", None)
+        if quota_project_id:
+            request_headers["x-goog-user-project"] = quota_project_id
+        response, content = self.http.request(uri, method, body=body, headers=request_headers, **kwargs)
+        if response.status in self._refresh_status_codes:
+            # The token was rejected early (e.g. revoked).  Resending it would only be rejected
+            # again, so refresh now and retry once with the new token.
+            self.credentials.refresh(self._request)
+            self._authorization_header = None
+            request_headers["authorization"] = self._get_authorization_header()
+            response, content = self.http.request(uri, method, body=body, headers=request_headers, **kwargs)
+        return response, content
+
+def connect_to_drive(use_service_account=True, service_account_file='service_account.json', token_path='token.json'):
+    """
+    Gets credentials and creates the Drive API service from them.  The result can be
+    reused for any number of downloads.
+
+    Args:
+        use_service_account (bool): Whether to use a service account.
+        service_account_file (str): Path to the service account JSON file.
+        token_path (str): Path to the user's token.json file.
+
+    Returns:
+        tuple: (credentials, service), or (None, None) on failure.
+    """
+    credentials = get_credentials(use_service_account, service_account_file, token_path)
+    if not credentials:
+        logging.error("Failed to obtain credentials.")
+        return None, None
+
+    service = create_service(credentials)
+    if not service:
+        logging.error("Failed to create Google Drive service.")
+        return None, None
+    return credentials, service
+
+def build_authorized_http(credentials):
+    """
+    Builds an authorized HTTP object whose connections are kept open and reused.
+
+    Args:
+        credentials: The credentials to authorize requests with.
+
+    Returns:
+        CachedTokenAuthorizedHttp: The HTTP object.
+    """
+    return CachedTokenAuthorizedHttp(credentials, http=httplib2.Http(cache=None, timeout=HTTP_TIMEOUT))
+
 def create_service(credentials):
     """
     Creates the Google Drive API service.
@@ -100,13 +226,48 @@ def create_service(credentials):
         googleapiclient.discovery.Resource: The Drive API service, or None on error.
     """
     try:
-        service = build('drive', 'v3', credentials=credentials)
+        # The Drive discovery document ships with google-api-python-client, so building the
+        # service needs no network round-trip (and there is nothing to cache).
+        service = build('drive', 'v3', http=build_authorized_http(credentials),
+                        static_discovery=True, cache_discovery=False)
         logging.info("Successfully created Google Drive API service.")
         return service
     except Exception as e:
         logging.error(f"Error creating Google Drive service: {e}")
         return None
 
+def get_thread_http(credentials):
+    """
+    Returns an authorized HTTP object owned by the calling thread.
+
+    Args:
+        credentials: The credentials to authorize requests with.
+
+    Returns:
+        CachedTokenAuthorizedHttp: The HTTP object for this thread.
+    """
+    http = getattr(_thread_local, 'http', None)
+    if http is None:
+        http = build_authorized_http(credentials)
+        _thread_local.http = http
+    return http
+
+def get_thread_session(credentials):
+    """
+    Returns an authorized requests session owned by the calling thread.
+
+    Args:
+        credentials: The credentials to authorize requests with.
+
+    Returns:
+        google.auth.transport.requests.AuthorizedSession: The session for this thread.
+    """
+    session = getattr(_thread_local, 'session', None)
+    if session is None:
+        session = AuthorizedSession(credentials)
+        _thread_local.session = session
+    return session
+
 def get_shared_folder_id(shared_url):
     """
     Extracts the folder ID from a Google Drive shared URL.
@@ -117,45 +278,126 @@ def get_shared_folder_id(shared_url):
     Returns:
         str: The folder ID, or None if the URL is invalid.
     """
-    if not shared_url:
+    if not shared_url or not isinstance(shared_url, str):
         return None
+    match = _FOLDER_ID_RE.search(shared_url)
+    return match.group(1) if match else None
+
+def has_rate_limit_reason(details):
+    """
+    Tells whether the error details of a Drive error response mark it as rate limiting.
+
+    Args:
+        details (list): The 'errors' entries of the error response.
+    """
+    return any(isinstance(detail, dict) and detail.get('reason') in RATE_LIMIT_REASONS
+               for detail in details)
+
+def get_response_error_details(response):
+    """
+    Returns the 'errors' entries of a Drive JSON error body.
+
+    Args:
+        response (requests.Response): The failed response, with its body already read.
+
+    Returns:
+        list: The error details, or an empty list if the body is not a Drive error.
+    """
     try:
-        # URL format: https://drive.google.com/drive/folders/{folder_id}?usp=sharing
-        # URL format: https://drive.google.com/folderview?id={folder_id}&usp=sharing  (older format)
-        if "folders/" in shared_url:
-            folder_id = shared_url.split("folders/")[1].split("?")[0]
-        elif "folderview?id=" in shared_url:
-            folder_id = shared_url.split("folderview?id=")[1].split("&")[0]
-        else:
-            return None
-        return folder_id
-    except IndexError:
-        return None
-    except TypeError:
-        return None
+        details = response.json()['error']['errors']
+    except (ValueError, KeyError, TypeError):
+        return []
+    return details if isinstance(details, list) else []
+
+def raise_for_status(response):
+    """
+    Raises requests.HTTPError for a failed streamed response, reading its (small)
+    error body first so that is_retryable can still inspect it once the response
+    has been closed.
+
+    Args:
+        response (requests.Response): The response to check.
+    """
+    if not response.ok:
+        response.content  # Loads and keeps the body
+    response.raise_for_status()
+
+def is_retryable(error):
+    """
+    Tells whether an error is transient and the failed call is worth retrying later.
 
-def list_files_in_folder(service, folder_id):
+    Args:
+        error (Exception): The error raised by an API call or download.
+
+    Returns:
+        bool: True for rate limiting, server errors and dropped connections.
+    """
+    if isinstance(error, HttpError):
+        if error.resp.status == 403:
+            return has_rate_limit_reason(getattr(error, 'error_details', None) or [])
+        return error.resp.status in RETRYABLE_STATUS_CODES
+    if isinstance(error, requests.HTTPError):
+        if error.response is None:
+            return False
+        if error.response.status_code == 403:
+            return has_rate_limit_reason(get_response_error_details(error.response))
+        return error.response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (requests.ConnectionError, requests.Timeout,
+                              requests.exceptions.ChunkedEncodingError,
+                              ConnectionError, TimeoutError))
+
+def retry_delay(attempt):
+    """
+    Returns the exponential backoff delay, in seconds, before retry number attempt + 1.
+
+    Args:
+        attempt (int): The number of retries made so far.
+    """
+    return RETRY_BASE_DELAY * 2 ** attempt + random.random()
+
+def build_list_request(service, folder_id, page_token=None):
+    """
+    Builds the request for one page of a folder listing.
+
+    Args:
+        service: The Google Drive API service.
+        folder_id: The ID of the folder to list.
+        page_token: The token of the page to fetch, or None for the first page.
+
+    Returns:
+        googleapiclient.http.HttpRequest: The unexecuted request.
+    """
+    # Add 'supportsAllDrives': True to include files in shared drives.
+    # Only request the fields we use, as many per page as Drive allows, in a stable order
+    # so that page tokens always continue where the previous page ended.
+    return service.files().list(q=f"'{folder_id}' in parents and trashed=false",
+                                fields="nextPageToken, files(id, name, mimeType, size)",
+                                pageSize=LIST_PAGE_SIZE,
+                                orderBy="folder,name",
+                                pageToken=page_token,
+                                supportsAllDrives=True,
+                                includeItemsFromAllDrives=True)
+
+def list_files_in_folder(service, folder_id, page_token=None, http=None):
     """
     Lists all files and subfolders within a specified folder.  Includes recursive listing.
 
     Args:
         service: The Google Drive API service.
         folder_id: The ID of the folder to list.
+        page_token: The page to start from, or None to list from the beginning.
+        http: The HTTP object to send requests with, or None for the service's own.
 
     Returns:
         list: A list of dictionaries, where each dictionary represents a file or folder.
-              Returns an empty list on error.  Handles pagination.
+              Returns None on error, so that a failed listing is not mistaken for an
+              empty folder.  Handles pagination.
     """
     results = []
     try:
-        page_token = None
         while True:
-            # Add 'supportsAllDrives': True to include files in shared drives.
-            results_page = service.files().list(q=f"'{folder_id}' in parents and trashed=false",
-                                             fields="nextPageToken, files(id, name, mimeType)",
-                                             pageToken=page_token,
-                                             supportsAllDrives=True,
-                                             includeItemsFromAllDrives=True).execute()
+            # googleapiclient backs off and retries rate limits and server errors itself.
+            results_page = build_list_request(service, folder_id, page_token).execute(http=http, num_retries=MAX_RETRIES)
             if not results_page:
                 break
             items = results_page.get('files', [])
@@ -166,89 +408,604 @@ def list_files_in_folder(service, folder_id):
             if not page_token:
                 break
         return results
-    except HttpError as error:
-        logging.error(f"An error occurred: {error}")
-        return []  # Return empty list on error to avoid crashing
+    except Exception as error:
+        # Transient errors have already been retried by execute(); anything left is final.
+        logging.error(f"An error occurred listing folder {folder_id}: {error}")
+        return None
 
-def download_file(service, file_id, file_name, download_path):
+def list_files_in_folders(service, folder_ids, http=None):
     """
-    Downloads a file from Google Drive.
+    Lists the contents of several folders at once.
+
+    The first page of every listing is fetched through Drive batch requests (up to
+    MAX_BATCH_SIZE listings per HTTP round-trip).  Folders with more pages, and folders
+    whose batched listing failed with a transient error, are then finished one by one
+    (with retries).
 
     Args:
         service: The Google Drive API service.
+        folder_ids (list): The IDs of the folders to list.
+        http: The HTTP object to send requests with, or None for the service's own.
+
+    Returns:
+        dict: Maps each folder ID to its list of file dictionaries.  Folders that
+              could not be listed map to None.
+    """
+    # Batch request IDs must be unique, and a folder can have more than one parent.
+    folder_ids = list(dict.fromkeys(folder_ids))
+    if len(folder_ids) == 1:
+        return {folder_ids[0]: list_files_in_folder(service, folder_ids[0], http=http)}
+
+    results = dict.fromkeys(folder_ids)  # Stays None unless the listing succeeds
+    page_tokens = {}
+    retry_ids = []
+
+    def handle_page(request_id, response, exception):
+        if exception is not None:
+            if is_retryable(exception):
+                retry_ids.append(request_id)
+            else:
+                logging.error(f"An error occurred listing folder {request_id}: {exception}")
+            return
+        results[request_id] = response.get('files', [])
+        if response.get('nextPageToken'):
+            page_tokens[request_id] = response['nextPageToken']
+
+    for start in range(0, len(folder_ids), MAX_BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=handle_page)
+        for folder_id in folder_ids[start:start + MAX_BATCH_SIZE]:
+            batch.add(build_list_request(service, folder_id), request_id=folder_id)
+        try:
+            batch.execute(http=http)
+        except Exception as error:
+            # batch.execute() has no retries of its own, so fall back to single listings.
+            if not is_retryable(error):
+                logging.error(f"A batch listing failed: {error}")
+                continue
+            logging.warning(f"A batch listing failed, listing its folders one by one: {error}")
+            retry_ids.extend(folder_id for folder_id in folder_ids[start:start + MAX_BATCH_SIZE]
+                             if results[folder_id] is None and folder_id not in retry_ids)
+
+    for folder_id in retry_ids:
+        results[folder_id] = list_files_in_folder(service, folder_id, http=http)
+    for folder_id, page_token in page_tokens.items():
+        remaining = list_files_in_folder(service, folder_id, page_token, http)
+        # A folder whose later pages failed is incomplete, so treat it as failed.
+        results[folder_id] = None if remaining is None else results[folder_id] + remaining
+    return results
+
+class DownloadCancelled(Exception):
+    """Raised inside a download when the user has asked to stop."""
+
+def check_cancelled(cancel_event):
+    """
+    Raises DownloadCancelled if the cancel event has been set.
+
+    Args:
+        cancel_event (threading.Event): The event to check, or None.
+    """
+    if cancel_event is not None and cancel_event.is_set():
+        raise DownloadCancelled()
+
+def remove_partial_file(file_path):
+    """
+    Removes a file left behind by an interrupted download, if there is one.
+
+    Args:
+        file_path (str): The path of the file.
+    """
+    try:
+        os.remove(file_path)
+    except OSError:
+        pass
+
+def make_progress_reporter(progress_callback, file_name, total):
+    """
+    Builds a thread-safe function that adds downloaded bytes to a running total
+    and passes it to the progress callback.
+
+    Args:
+        progress_callback: Called as progress_callback(file_name, bytes_done, total), or None.
+        file_name (str): The name of the file being downloaded.
+        total (int): The size of the file in bytes, or None if unknown.
+
+    Returns:
+        function: Takes the number of bytes just written.
+    """
+    lock = threading.Lock()
+    bytes_done = 0
+
+    def report(count):
+        nonlocal bytes_done
+        with lock:
+            bytes_done += count
+            current = bytes_done
+        if progress_callback:
+            progress_callback(file_name, current, total)
+    return report
+
+def write_chunks(chunks, fh, report, cancel_event):
+    """
+    Writes an iterable of byte chunks to a file, reporting progress and stopping on cancel.
+
+    Args:
+        chunks: The byte chunks to write.
+        fh: The file object to write to.
+        report: The progress reporter from make_progress_reporter.
+        cancel_event (threading.Event): Set to abort the download, or None.
+
+    Returns:
+        int: The number of bytes written.
+    """
+    written = 0
+    for chunk in chunks:
+        check_cancelled(cancel_event)
+        fh.write(chunk)
+        written += len(chunk)
+        report(len(chunk))
+    return written
+
+def check_complete(received, expected, description):
+    """
+    Raises a (retryable) ConnectionError if a download ended before all of its bytes arrived.
+
+    Preallocated files are already full size, so a short body would otherwise go
+    unnoticed and leave zero-filled holes behind.
+
+    Args:
+        received (int): The number of bytes written.
+        expected (int): The number of bytes that should have been written, or None if unknown.
+        description (str): What was being downloaded, for the error message.
+    """
+    if expected is not None and received != expected:
+        raise ConnectionError(f"{description} ended after {received} of {expected} bytes.")
+
+def stream_download(session, uri, fh, report, cancel_event=None, size=None):
+    """
+    Streams a media download into an open file with a single GET request.
+
+    Args:
+        session (requests.Session): The authorized session to send the request with.
+        uri (str): The media download URI.
+        fh: The file object to write to.
+        report: The progress reporter from make_progress_reporter.
+        cancel_event (threading.Event): Set to abort the download, or None.
+        size (int): The expected size of the file in bytes, or None if unknown.
+    """
+    with session.get(uri, stream=True, timeout=HTTP_TIMEOUT) as response:
+        raise_for_status(response)
+        received = write_chunks(response.iter_content(chunk_size=STREAM_CHUNK_SIZE), fh, report, cancel_event)
+    check_complete(received, size, "Download")
+
+def open_new_file(file_path):
+    """
+    Opens a file for buffered binary writing, replacing any existing file.
+
+    Args:
+        file_path (str): The path of the file.
+
+    Returns:
+        io.BufferedWriter: The open file.
+    """
+    try:
+        # Creating exclusively tells us whether the file existed without a separate stat.
+        return open(file_path, 'xb', buffering=WRITE_BUFFER_SIZE)
+    except FileExistsError:
+        logging.warning(f"File already exists: {file_path}. Overwriting.")
+        return open(file_path, 'wb', buffering=WRITE_BUFFER_SIZE)
+
+def reserve_disk_space(fh, size):
+    """
+    Grows an open, empty file to its final size, reserving the blocks where supported.
+
+    Args:
+        fh: The open file.
+        size (int): The final size of the file in bytes.
+    """
+    try:
+        # Reserving the blocks up front avoids fragmentation from out-of-order writes.
+        os.posix_fallocate(fh.fileno(), 0, size)
+    except (AttributeError, OSError):
+        # Not available on this platform or filesystem; a sparse file works too.
+        fh.truncate(size)
+
+def release_page_cache(file_path):
+    """
+    Flushes a finished file to disk and drops it from the page cache.  Downloaded
+    files are written once and not read back, so caching them only evicts more
+    useful pages.  Does nothing where posix_fadvise is unavailable, and never raises.
+
+    Args:
+        file_path (str): The path of the file.
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            # Only clean pages can be dropped, so write the file back first.
+            os.fdatasync(fd)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    except OSError as e:
+        # Only a cache hint (some FUSE and network filesystems reject it); the file is complete.
+        logging.debug(f"Could not drop {file_path} from the page cache: {e}")
+
+def download_range(credentials, uri, file_path, start, end, report, cancel_event=None):
+    """
+    Downloads one byte range of a media URI into the same span of an existing file.
+
+    Args:
+        credentials: The credentials to authorize the request with.
+        uri (str): The media download URI.
+        file_path (str): The preallocated file to write into.
+        start (int): The first byte of the range.
+        end (int): The last byte of the range (inclusive).
+        report: The progress reporter from make_progress_reporter.
+        cancel_event (threading.Event): Set to abort the download, or None.
+    """
+    session = get_thread_session(credentials)
+    with session.get(uri, headers={'Range': f'bytes={start}-{end}'}, stream=True,
+                     timeout=HTTP_TIMEOUT) as response:
+        raise_for_status(response)
+        if response.status_code != 206:
+            raise RuntimeError(f"Server did not honor the range request for bytes {start}-{end}.")
+        with open(file_path, 'r+b', buffering=WRITE_BUFFER_SIZE) as fh:
+            fh.seek(start)
+            received = write_chunks(response.iter_content(chunk_size=STREAM_CHUNK_SIZE), fh, report, cancel_event)
+    check_complete(received, end - start + 1, f"Range {start}-{end}")
+
+def parallel_download(credentials, uri, file_path, size, report, cancel_event=None, range_executor=None):
+    """
+    Downloads a large file as DOWNLOAD_CHUNK_SIZE byte ranges fetched over
+    MAX_RANGE_WORKERS connections at once.
+
+    Args:
+        credentials: The credentials to authorize the requests with.
+        uri (str): The media download URI.
+        file_path (str): The path to write the file to.
+        size (int): The size of the file in bytes.
+        report: The progress reporter from make_progress_reporter.
+        cancel_event (threading.Event): Set to abort the download, or None.
+        range_executor (concurrent.futures.Executor): Runs the range requests.  Sharing
+            one across files lets its threads keep their sessions' connections open
+            between files.  If None, a short-lived one is created for this file.
+
+    Raises:
+        Exception: The first error raised while downloading a range.
+    """
+    if range_executor is None:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_RANGE_WORKERS) as range_executor:
+            return parallel_download(credentials, uri, file_path, size, report, cancel_event, range_executor)
+
+    with open_new_file(file_path) as fh:
+        reserve_disk_space(fh, size)
+    starts = iter(range(0, size, DOWNLOAD_CHUNK_SIZE))
+
+    def submit_next_range():
+        """Submits the next range, returning its future, or None when all are submitted."""
+        start = next(starts, None)
+        if start is None:
+            return None
+        return range_executor.submit(download_range, credentials, uri, file_path,
+                                     start, min(start + DOWNLOAD_CHUNK_SIZE, size) - 1,
+                                     report, cancel_event)
+
+    # The executor is shared by every file, so keep at most MAX_RANGE_WORKERS of this
+    # file's ranges in flight, and stop submitting new ones once a range has failed.
+    running = {future for future in (submit_next_range() for _ in range(MAX_RANGE_WORKERS)) if future}
+    try:
+        while running:
+            done, running = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                future.result()
+                next_future = submit_next_range()
+                if next_future:
+                    running.add(next_future)
+    finally:
+        # Don't let ranges still in flight write into a file the caller is about to remove.
+        concurrent.futures.wait(running)
+    release_page_cache(file_path)
+
+def download_file(service, file_id, file_name, mime_type, download_path, credentials, size=None,
+                  progress_callback=None, cancel_event=None, range_executor=None):
+    """
+    Downloads a file from Google Drive.  Safe to call from worker threads.
+
+    The file is fetched with a per-thread requests session straight into the output
+    file, without going through googleapiclient's media download helpers.
+
+    Args:
+        service: The Google Drive API service (only used to build the download URI).
         file_id: The ID of the file to download.
         file_name: The name of the file.
+        mime_type: The file's MIME type, as returned by the folder listing.
         download_path: The path to download the file to.
+        credentials: The credentials to authorize the download with.
+        size: The file size in bytes as returned by the folder listing, if known.
+              Files larger than PARALLEL_DOWNLOAD_THRESHOLD are fetched as parallel
+              ranges; all others are streamed in one request.
+        progress_callback: Called as progress_callback(file_name, bytes_done, total)
+                           as data is written, or None.
+        cancel_event (threading.Event): Set to abort the download, or None.  A cancelled
+                                        download removes its partial file.
+        range_executor (concurrent.futures.Executor): Passed on to parallel_download, or None.
+
+    Raises:
+        Exception: Any error other than cancellation, so that the caller can retry
+                   transient ones (see is_retryable) and count the rest as failed.  Errors
+                   that are not transient are logged first.  Either way the partial file
+                   is removed.
     """
+    if mime_type == 'application/vnd.google-apps.folder':
+        logging.info(f"Skipping download of folder: {file_name} (ID: {file_id})")
+        return  # Skip folders, we handle them in list_files_in_folder
+    if cancel_event is not None and cancel_event.is_set():
+        return  # Nothing has been written yet, so there is nothing to clean up
+
+    file_path = os.path.join(download_path, file_name)
     try:
-        # Get the file metadata to check if it's a folder.
-        file_metadata = service.files().get(fileId=file_id, supportsAllDrives=True).execute()
-        if file_metadata['mimeType'] == 'application/vnd.google-apps.folder':
-            logging.info(f"Skipping download of folder: {file_name} (ID: {file_id})")
-            return  # Skip folders, we handle them in list_files_in_folder
-
-        # Check if the file already exists and handle overwriting
-        file_path = os.path.join(download_path, file_name)
-        if os.path.exists(file_path):
-            logging.warning(f"File already exists: {file_path}. Overwriting.")
-
-        request = service.files().get_media(fileId=file_id, supportsAllDrives=True)
-        fh = io.FileIO(file_path, 'wb')
-        downloader = MediaIoBaseDownload(fh, request)
-        done = False
-        while not done:
-            status, done = downloader.next_chunk()
-            # No progress bar in GUI version.
-            # print(f"Download {int(status.progress() * 100)}.")
+        size = int(size) if size is not None else None  # Drive reports sizes as strings
+        report = make_progress_reporter(progress_callback, file_name, size)
+        # Only the URI is used; the request itself is never executed.
+        uri = service.files().get_media(fileId=file_id, supportsAllDrives=True).uri
+        if size is not None and size > PARALLEL_DOWNLOAD_THRESHOLD:
+            parallel_download(credentials, uri, file_path, size, report, cancel_event, range_executor)
+        else:
+            with open_new_file(file_path) as fh:
+                if size is not None and size > DOWNLOAD_CHUNK_SIZE:
+                    reserve_disk_space(fh, size)
+                stream_download(get_thread_session(credentials), uri, fh, report, cancel_event, size)
         logging.info(f"Downloaded: {file_name} to {file_path}")
-    except HttpError as error:
+    except DownloadCancelled:
+        logging.info(f"Cancelled download of {file_name}.")
+        remove_partial_file(file_path)
+    except Exception as error:
+        remove_partial_file(file_path)
+        if is_retryable(error):
+            logging.warning(f"A transient error occurred during download of {file_name}: {error}")
+            raise  # Let the DownloadScheduler try again later
         logging.error(f"An error occurred during download of {file_name}: {error}")
-    except Exception as e:
-        logging.error(f"An unexpected error occurred during download of {file_name}: {e}")
+        raise  # Let the DownloadScheduler count it as failed
 
-def process_files(service, files, download_path, parent_folder_name=""):
-    """Processes the list of files, downloading them or recursively entering folders.
+class PendingCounter:
+    """
+    Thread-safe count of outstanding work items that can be waited on until it drops to zero.
+    """
+    def __init__(self):
+        self._count = 0
+        self._condition = threading.Condition()
+
+    def add(self, count=1):
+        """Records new outstanding items."""
+        with self._condition:
+            self._count += count
+
+    def done(self, count=1):
+        """Marks items as finished, waking up waiters once none are left."""
+        with self._condition:
+            self._count -= count
+            if self._count == 0:
+                self._condition.notify_all()
+
+    def wait(self):
+        """Blocks until every recorded item has been marked as finished."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._count == 0)
+
+class DownloadScheduler:
+    """
+    Runs downloads on an executor and re-submits the ones that fail with a transient
+    error.  Failed jobs wait in a heap ordered by (retry time, try count) so that a
+    backing-off download never occupies a worker thread; a single re-queuer thread
+    hands them back to the executor when they are due.  Jobs that still fail after
+    MAX_RETRIES retries, or that fail with an error that is not transient, are counted
+    as failed.
+    """
+    def __init__(self, executor, cancel_event=None):
+        self._executor = executor
+        self._cancel_event = cancel_event
+        self._pending = PendingCounter()
+        self._retry_heap = []  # (retry_at, try_count, sequence, name, func, args) entries
+        self._sequence = itertools.count()  # Breaks ties so functions are never compared
+        self._condition = threading.Condition()
+        self._closed = False
+        self._failed = 0
+        self._requeuer = threading.Thread(target=self._requeue_loop, daemon=True)
+        self._requeuer.start()
+
+    def submit(self, name, func, *args):
+        """Schedules func(*args) to run on the executor.  name identifies the job in log messages."""
+        self._pending.add()
+        self._executor.submit(self._run, name, func, args, 0)
+
+    def join(self):
+        """
+        Waits until every submitted job has succeeded or given up, then stops the re-queuer.
 
-       Handles subfolders correctly by creating corresponding directories.
+        Returns:
+            int: The number of jobs that failed.
+        """
+        self._pending.wait()
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._requeuer.join()
+        return self._failed
+
+    def _run(self, name, func, args, try_count):
+        """Runs one job on a worker thread, queueing it for a retry on transient errors."""
+        try:
+            func(*args)
+        except Exception as error:
+            retryable = is_retryable(error)
+            if try_count < MAX_RETRIES and retryable:
+                delay = retry_delay(try_count)
+                logging.info(f"Retrying {name} in {delay:.1f} seconds (retry {try_count + 1} of {MAX_RETRIES}).")
+                with self._condition:
+                    heapq.heappush(self._retry_heap,
+                                   (time.monotonic() + delay, try_count + 1, next(self._sequence), name, func, args))
+                    self._condition.notify()
+                return  # Still pending until the retry finishes
+            if retryable:
+                logging.error(f"Giving up on {name} after {try_count + 1} attempt(s): {error}")
+            # Other errors have already been reported by the job itself.
+            with self._condition:
+                self._failed += 1
+        self._pending.done()
+
+    def _requeue_loop(self):
+        """Hands due retries back to the executor until join() is called."""
+        with self._condition:
+            while not self._closed:
+                cancelled = self._cancel_event is not None and self._cancel_event.is_set()
+                now = time.monotonic()
+                # Once cancelled, release everything at once; the jobs return right away.
+                while self._retry_heap and (cancelled or self._retry_heap[0][0] <= now):
+                    _, try_count, _, name, func, args = heapq.heappop(self._retry_heap)
+                    self._executor.submit(self._run, name, func, args, try_count)
+                timeout = self._retry_heap[0][0] - now if self._retry_heap else None
+                if self._cancel_event is not None:
+                    # Wake up regularly to notice cancellation during long backoffs.
+                    timeout = 0.5 if timeout is None else min(timeout, 0.5)
+                self._condition.wait(timeout)
+
+def process_files(service, files, download_path, scheduler, credentials, parent_folder_name="",
+                  progress_callback=None, cancel_event=None, range_executor=None):
+    """Processes the list of files, downloading them and walking into subfolders.
+
+       Subfolders go onto a work queue served by MAX_LIST_WORKERS listing threads, so
+       listing one deep branch never holds up the rest of the tree.  Downloads are
+       submitted to the scheduler as soon as their folder has been listed.
 
     Args:
         service: The Google Drive API service.
         files (list):  A list of file dictionaries.
         download_path (str): The base download path.
+        scheduler (DownloadScheduler): Runs (and retries) the downloads.
+        credentials: The credentials used by the listing and download threads.
         parent_folder_name (str): The name of the parent folder (for creating subdirectories).
+        progress_callback: Passed on to download_file, or None.
+        cancel_event (threading.Event): Set to stop listing and downloading, or None.
+        range_executor (concurrent.futures.Executor): Passed on to download_file, or None.
+
+    Returns once the whole tree has been listed; downloads may still be running.
+
+    Returns:
+        bool: True if every folder could be listed.
     """
-    for file_data in files:
-        file_id = file_data['id']
-        file_name = file_data['name']
-        mime_type = file_data['mimeType']
-
-        # Construct the correct download path, including subfolders
-        current_download_path = download_path
-        if parent_folder_name:
-            current_download_path = os.path.join(download_path, parent_folder_name)
-            # Create the subfolder if it doesn't exist
-            if not os.path.exists(current_download_path):
-                try:
-                    os.makedirs(current_download_path)
-                    logging.info(f"Created directory: {current_download_path}")
-                except OSError as e:
-                    logging.error(f"Failed to create directory {current_download_path}: {e}")
-                    # Don't try to download into a folder we couldn't create.  Log and continue.
-                    continue
-
-        if mime_type == 'application/vnd.google-apps.folder':
-            logging.info(f"Processing folder: {file_name} (ID: {file_id})")
-            # Recursively process files in the subfolder
-            sub_files = list_files_in_folder(service, file_id)
-            if sub_files:
-                process_files(service, sub_files, download_path, os.path.join(parent_folder_name, file_name) if parent_folder_name else file_name)
-            else:
-                logging.info(f"Folder {file_name} is empty.")
+    folder_queue = queue.Queue()  # (folder_id, folder_path) items, None tells a worker to stop
+    pending_folders = PendingCounter()
+    failed_folders = []  # Paths of folders whose listing failed; appended from the workers
+    claimed_paths = set()  # Normalized local paths already handed to a download
+    claimed_paths_lock = threading.Lock()
+
+    def claim_file_name(folder_path, file_name):
+        """Returns a name under which file_name can be saved in folder_path without
+        sharing the file with another download.
+
+        Drive allows several files with the same name in one folder (and same-named
+        folders end up in one directory), so later ones are saved as "name (1).ext",
+        "name (2).ext" and so on.
+        """
+        base, extension = os.path.splitext(file_name)
+        candidate = file_name
+        with claimed_paths_lock:
+            for number in itertools.count(1):
+                path = os.path.normcase(os.path.join(folder_path, candidate))
+                if path not in claimed_paths:
+                    break
+                candidate = f"{base} ({number}){extension}"
+            claimed_paths.add(path)
+        if candidate != file_name:
+            logging.warning(f"Another file in {folder_path} is also named {file_name}; saving this one as {candidate}.")
+        return candidate
+
+    def handle_listing(listed_files, folder_path):
+        """Submits the downloads of one listed folder and queues its subfolders.
+
+        folder_path is the folder's local directory, already joined and normalized
+        once so that none of its files or subfolders have to rebuild it.
+        """
+        if cancel_event is not None and cancel_event.is_set():
+            return
+        # Create the directory once for all of its files.
+        try:
+            os.makedirs(folder_path)
+            logging.info(f"Created directory: {folder_path}")
+        except FileExistsError:
+            pass
+        except OSError as e:
+            logging.error(f"Failed to create directory {folder_path}: {e}")
+            # Don't try to download into a folder we couldn't create.  Log and move on.
+            return
 
-        else:
-            download_file(service, file_id, file_name, current_download_path)
+        for file_data in listed_files:
+            file_id = file_data['id']
+            file_name = file_data['name']
+            mime_type = file_data['mimeType']
 
-def download_files_from_shared_link(shared_url, download_path, use_service_account=True, service_account_file='service_account.json', token_path='token.json'):
+            if mime_type == 'application/vnd.google-apps.folder':
+                logging.info(f"Processing folder: {file_name} (ID: {file_id})")
+                pending_folders.add()
+                folder_queue.put((file_id, os.path.join(folder_path, file_name)))
+            else:
+                file_name = claim_file_name(folder_path, file_name)
+                scheduler.submit(os.path.join(folder_path, file_name), download_file, service, file_id,
+                                 file_name, mime_type, folder_path, credentials, file_data.get('size'), progress_callback, cancel_event,
+                                 range_executor)
+
+    def list_worker():
+        """Lists queued folders, taking as many as fit in one batch request at a time."""
+        http = get_thread_http(credentials)
+        while True:
+            item = folder_queue.get()
+            if item is None:
+                return
+            batch = [item]
+            # No stop marker can be queued while this worker still holds pending folders.
+            while len(batch) < MAX_BATCH_SIZE:
+                try:
+                    batch.append(folder_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if cancel_event is not None and cancel_event.is_set():
+                pending_folders.done(len(batch))
+                continue
+            try:
+                listings = list_files_in_folders(service, [folder_id for folder_id, _ in batch], http)
+            except Exception as error:
+                # A dead worker would leave its folders pending forever, so never let this escape.
+                logging.error(f"An unexpected error occurred while listing folders: {error}")
+                listings = {}
+            for folder_id, folder_path in batch:
+                try:
+                    sub_files = listings.get(folder_id)
+                    if sub_files is None:
+                        logging.error(f"Could not list folder {folder_path}; its contents were not downloaded.")
+                        failed_folders.append(folder_path)
+                    elif sub_files:
+                        handle_listing(sub_files, folder_path)
+                    else:
+                        logging.info(f"Folder {folder_path} is empty.")
+                finally:
+                    # Subfolders were counted by handle_listing before this folder is released.
+                    pending_folders.done()
+
+    handle_listing(files, os.path.normpath(os.path.join(download_path, parent_folder_name)))
+    workers = [threading.Thread(target=list_worker, daemon=True) for _ in range(MAX_LIST_WORKERS)]
+    for worker in workers:
+        worker.start()
+    pending_folders.wait()
+    for worker in workers:
+        folder_queue.put(None)
+    for worker in workers:
+        worker.join()
+    return not failed_folders
+
+def download_files_from_shared_link(shared_url, download_path, use_service_account=True, service_account_file='service_account.json', token_path='token.json', max_workers=MAX_DOWNLOAD_WORKERS,
+                                    progress_callback=None, cancel_event=None, connection=None):
     """
     Downloads all files and subfolders from a Google Drive shared link.
 
@@ -258,6 +1015,15 @@ def download_files_from_shared_link(shared_url, download_path, use_service_accou
         use_service_account (bool): Whether to use a service account.
         service_account_file (str): Path to the service account JSON file.
         token_path (str): Path to the user's token.json file.
+        max_workers (int): Maximum number of files downloaded at the same time.
+        progress_callback: Called as progress_callback(file_name, bytes_done, total) from
+                           the download threads, or None.
+        cancel_event (threading.Event): Set from any thread to stop the download, or None.
+        connection (tuple): A (credentials, service) pair from connect_to_drive to reuse.
+                            If None, a new one is created from the authentication arguments.
+
+    Returns:
+        bool: True on success, False on failure or cancellation.
     """
     if not shared_url:
         logging.error("Shared URL is required.")
@@ -267,27 +1033,46 @@ def download_files_from_shared_link(shared_url, download_path, use_service_accou
         logging.error("Download path is required.")
         return False # Indicate failure
 
+    if max_workers < 1:
+        logging.error("At least one download worker is required.")
+        return False # Indicate failure
+
     folder_id = get_shared_folder_id(shared_url)
     if not folder_id:
         logging.error("Invalid Google Drive shared URL.")
         return False # Indicate failure
 
-    credentials = get_credentials(use_service_account, service_account_file, token_path)
-    if not credentials:
-        logging.error("Failed to obtain credentials.")
-        return False # Indicate failure
-
-    service = create_service(credentials)
+    credentials, service = connection or connect_to_drive(use_service_account, service_account_file, token_path)
     if not service:
-        logging.error("Failed to create Google Drive service.")
-        return False # Indicate failure
+        return False # Indicate failure (connect_to_drive already logged why)
 
     files = list_files_in_folder(service, folder_id)
+    if files is None:
+        logging.error("Failed to access the shared folder.")
+        return False # Indicate failure
     if not files:
-        logging.warning("No files found in the shared folder or error accessing folder.")
+        logging.warning("No files found in the shared folder.")
         return True #  No files is not an error, but an empty folder.
 
-    process_files(service, files, download_path)
+    # Range requests of large files get their own long-lived threads, so each thread's
+    # session keeps its connections open from one file to the next.  Downloads wait on
+    # their ranges, so sharing the download executor could deadlock.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers * MAX_RANGE_WORKERS) as range_executor, \
+         concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        scheduler = DownloadScheduler(executor, cancel_event)
+        all_listed = process_files(service, files, download_path, scheduler, credentials,
+                                   progress_callback=progress_callback, cancel_event=cancel_event,
+                                   range_executor=range_executor)
+        failed_downloads = scheduler.join()
+    if cancel_event is not None and cancel_event.is_set():
+        logging.info("Download cancelled.")
+        return False # Indicate the download did not finish
+    if not all_listed:
+        logging.error("Some folders could not be listed, so their files were not downloaded.")
+        return False # Indicate failure
+    if failed_downloads:
+        logging.error(f"{failed_downloads} file(s) could not be downloaded.")
+        return False # Indicate failure
     return True # Indicate success
 
 class DriveDownloaderGUI(tk.Tk):
@@ -319,9 +1104,23 @@ class DriveDownloaderGUI(tk.Tk):
         self.download_path = tk.StringVar()
         self.use_service_account = tk.BooleanVar(value=True)  # Default to service account
         self.status_text = tk.StringVar(value="Ready")  # Status message
+        # Worker threads never touch Tk directly.  They overwrite these slots (a single
+        # attribute assignment, atomic under the GIL) and _tick_status applies the latest
+        # value, so Tk sees at most one update per tick however fast events arrive.
+        self._latest_status = None  # Status text, or a (file_name, bytes_done, total) progress tuple
+        self._shown_status = None
+        self._download_finished = False
+        # The whole download runs as a single future so it can be cancelled and awaited.
+        self.download_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.download_future = None
+        self.cancel_event = threading.Event()
+        # (credentials, service) per authentication mode, reused across downloads.
+        self.connections = {}
 
         # UI elements
         self.create_widgets()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.after(50, self._tick_status)
 
     def create_widgets(self):
         """Creates the UI elements."""
@@ -350,7 +1149,11 @@ class DriveDownloaderGUI(tk.Tk):
 
         # Download Button
         download_button = ttk.Button(self.main_frame, text="Download", command=self.start_download)
-        download_button.pack(pady=(10, 20), fill="x")
+        download_button.pack(pady=(10, 5), fill="x")
+
+        # Cancel Button (enabled only while a download runs)
+        self.cancel_button = ttk.Button(self.main_frame, text="Cancel", command=self.cancel_download, state="disabled")
+        self.cancel_button.pack(pady=(0, 20), fill="x")
 
         # Status Label
         ttk.Label(self.main_frame, text="Status:").pack(pady=(0, 5), anchor="w")
@@ -390,19 +1193,47 @@ class DriveDownloaderGUI(tk.Tk):
                 child.config(state="disabled")
                 break
 
-        self.status_text.set("Downloading...")
-        # Create a thread to perform the download
-        threading.Thread(target=self.perform_download, args=(shared_url, download_path, use_service_account)).start()
+        self.cancel_button.config(state="normal")
+
+        self.update_status("Downloading...")
+        self.cancel_event.clear()
+        # Run the download in the background
+        self.download_future = self.download_executor.submit(self.perform_download, shared_url, download_path, use_service_account)
+
+    def cancel_download(self):
+        """Asks the running download to stop.  Partially downloaded files are removed."""
+        if self.download_future and not self.download_future.done():
+            self.cancel_event.set()
+            self.cancel_button.config(state="disabled")
+            self.update_status("Cancelling...")
+
+    def on_close(self):
+        """Cancels any running download and closes the window."""
+        self.cancel_event.set()
+        self.download_executor.shutdown(wait=False)
+        self.destroy()
 
     def perform_download(self, shared_url, download_path, use_service_account):
         """
-        Performs the download operation.  This runs in a separate thread.
+        Performs the download operation.  This runs in a separate thread and always
+        re-enables the download button when it finishes, even if the download raised.
 
         Args:
             shared_url (str): The shared URL.
             download_path (str): The download path.
             use_service_account (bool): Whether to use a service account.
         """
+        try:
+            self._perform_download(shared_url, download_path, use_service_account)
+        except Exception as e:
+            # Nothing awaits the future, so report the error here rather than losing it.
+            logging.exception(f"An unexpected error occurred during the download: {e}")
+            self.update_status("Download failed.")
+        finally:
+            self.enable_download_button()
+
+    def _perform_download(self, shared_url, download_path, use_service_account):
+        """Does the work of perform_download and posts the final status."""
         # Ensure the download path exists
         if not os.path.exists(download_path):
             try:
@@ -410,23 +1241,61 @@ class DriveDownloaderGUI(tk.Tk):
             except OSError as e:
                 logging.error(f"Error creating download directory: {e}")
                 self.update_status("Error: Could not create download directory.")
-                self.enable_download_button()
                 return
 
-        success = download_files_from_shared_link(shared_url, download_path, use_service_account)
+        connection = self.connections.get(use_service_account)
+        if connection is None:
+            connection = connect_to_drive(use_service_account)
+            if connection[1] is None:
+                self.update_status("Download failed.") # connect_to_drive already logs the specific error.
+                return
+            self.connections[use_service_account] = connection
+
+        success = download_files_from_shared_link(shared_url, download_path, use_service_account,
+                                                  progress_callback=self.report_progress,
+                                                  cancel_event=self.cancel_event,
+                                                  connection=connection)
         if success:
             self.update_status("Download complete!")
+        elif self.cancel_event.is_set():
+            self.update_status("Download cancelled.")
         else:
             self.update_status("Download failed.") # download_files_from_shared_link already logs the specific error.
-        self.enable_download_button()
 
     def update_status(self, text):
-        """Updates the status text in the GUI.  Must be called from the main thread."""
-        self.after(0, self.status_text.set, text)
+        """Updates the status text in the GUI.  Safe to call from any thread."""
+        self._latest_status = text
+
+    def report_progress(self, file_name, bytes_done, total):
+        """Reports download progress of one file.  Safe to call from any thread."""
+        if not self.cancel_event.is_set():
+            self._latest_status = (file_name, bytes_done, total)
 
     def enable_download_button(self):
-        """Enables the download button.  Must be called from the main thread."""
-        self.after(0, self.enable_download_button_internal)
+        """Enables the download button.  Safe to call from any thread."""
+        self._download_finished = True
+
+    def _tick_status(self):
+        """
+        Applies the latest status posted by worker threads.  Runs every 50 ms on the
+        main thread and touches Tk only when something changed.
+        """
+        status = self._latest_status
+        if status is not None and status is not self._shown_status:
+            self._shown_status = status
+            self.status_text.set(status if isinstance(status, str) else self.format_progress(*status))
+        if self._download_finished:
+            self._download_finished = False
+            self.enable_download_button_internal()
+        self.after(50, self._tick_status)
+
+    @staticmethod
+    def format_progress(file_name, bytes_done, total):
+        """Formats a progress message for the status label."""
+        megabytes = bytes_done / (1024 * 1024)
+        if total:
+            return f"Downloading {file_name}: {bytes_done * 100 // total}% ({megabytes:.1f} MB)"
+        return f"Downloading {file_name}: {megabytes:.1f} MB"
 
     def enable_download_button_internal(self):
         """Internal function to enable the download button."""
@@ -434,6 +1303,7 @@ class DriveDownloaderGUI(tk.Tk):
             if isinstance(child, ttk.Button) and child.cget("text") == "Download":
                 child.config(state="normal")
                 break
+        self.cancel_button.config(state="disabled")
 
     def show_error(self, message):
         """Displays an error message in the GUI."""
@@ -449,14 +1319,22 @@ class DriveDownloaderGUI(tk.Tk):
 if __name__ == "__main__":
     # Check for command-line arguments.  If provided, run in non-GUI mode.
     if len(sys.argv) > 1:
+        usage = "Usage: python script.py <shared_url> <download_path> [--no-service-account] [--workers N]"
         if len(sys.argv) < 3:
-            print("Usage: python script.py <shared_url> <download_path> [--no-service-account]")
+            print(usage)
             sys.exit(1)
         shared_url = sys.argv[1]
         download_path = sys.argv[2]
         use_service_account = "--no-service-account" not in sys.argv
+        max_workers = MAX_DOWNLOAD_WORKERS
+        if "--workers" in sys.argv:
+            try:
+                max_workers = int(sys.argv[sys.argv.index("--workers") + 1])
+            except (IndexError, ValueError):
+                print(usage)
+                sys.exit(1)
         print(f"Downloading from {shared_url} to {download_path} using service account: {use_service_account}")
-        success = download_files_from_shared_link(shared_url, download_path, use_service_account)
+        success = download_files_from_shared_link(shared_url, download_path, use_service_account, max_workers=max_workers)
         if success:
             print("Download completed successfully.")
         else: